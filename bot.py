@@ -253,6 +253,28 @@ class ShutdownManager:
             return False
 
 
+def install_fast_event_loop() -> bool:
+    """按需启用 uvloop 事件循环策略
+
+    仅在进程环境变量 MOFOX_USE_UVLOOP=1 且已安装 uvloop 时生效，避免默认修改全局事件循环策略。
+    需要在 asyncio.run 之前调用；.env 在事件循环启动后才加载，因此该变量需在启动环境中设置。
+
+    Returns:
+        bool: 是否已启用 uvloop
+    """
+    if os.getenv("MOFOX_USE_UVLOOP", "").lower() not in ("1", "true"):
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("已设置 MOFOX_USE_UVLOOP，但未安装 uvloop，继续使用默认事件循环")
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("已启用 uvloop 事件循环")
+    return True
+
+
 @asynccontextmanager
 async def create_event_loop_context():
     """创建事件循环的上下文管理器"""
@@ -674,6 +696,7 @@ async def main_async():
 if __name__ == "__main__":
     exit_code = 0
     try:
+        install_fast_event_loop()
         exit_code = asyncio.run(main_async())
     except KeyboardInterrupt:
         logger.info("程序被用户中断")
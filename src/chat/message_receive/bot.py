@@ -354,7 +354,7 @@ class ChatBot:
 
             # 先提取基础信息检查是否是自身消息上报
             from maim_message import BaseMessageInfo
-            temp_message_info = BaseMessageInfo.from_dict(message_data.get("message_info", {}))
+            temp_message_info = BaseMessageInfo.from_dict(message_info)
             if temp_message_info.additional_config:
                 sent_message = temp_message_info.additional_config.get("echo", False)
                 if sent_message:  # 这一段只是为了在一切处理前劫持上报的自身消息，用于更新message_id，需要ada支持上报事件，实际测试中不会对正常使用造成任何问题
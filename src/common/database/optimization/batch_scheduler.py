@@ -175,17 +175,19 @@ class AdaptiveBatchScheduler:
         Returns:
             Future对象，可用于获取结果
         """
+        loop = asyncio.get_running_loop()
+
         # 检查缓存
         if operation.operation_type == "select":
             cache_key = self._generate_cache_key(operation)
             cached_result = self._get_from_cache(cache_key)
             if cached_result is not None:
-                future = asyncio.get_event_loop().create_future()
+                future = loop.create_future()
                 future.set_result(cached_result)
                 return future
 
         # 创建future
-        future = asyncio.get_event_loop().create_future()
+        future = loop.create_future()
         operation.future = future
 
         should_execute_immediately = False
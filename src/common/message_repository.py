@@ -210,6 +210,69 @@ async def count_messages(message_filter: dict[str, Any]) -> int:
         return 0
 
 
+async def get_messages_before_timestamp_from_streams(
+    stream_ids: list[str],
+    timestamp_before: float,
+    limit_per_stream: int,
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    一次性从多个聊天流中获取指定时间戳之前的近期消息。
+
+    Args:
+        stream_ids: 要查询的聊天流ID列表。
+        timestamp_before: 只获取此时间戳之前的消息。
+        limit_per_stream: 每个聊天流中获取的消息数量上限，0表示不限制。
+
+    Returns:
+        一个字典，键为 stream_id，值为该聊天流中按时间升序排列的消息列表。
+    """
+    if not stream_ids:
+        return {}
+
+    try:
+        async with get_db_session() as session:
+            conditions = (Messages.chat_id.in_(stream_ids), Messages.time < timestamp_before)
+            if limit_per_stream > 0:
+                # 使用 CTE 和 row_number() 为每个聊天流中的消息排序编号，只保留最新的 `limit_per_stream` 条
+                ranked_messages_cte = (
+                    select(
+                        Messages,
+                        func.row_number()
+                        .over(partition_by=Messages.chat_id, order_by=Messages.time.desc())
+                        .label("row_num"),
+                    )
+                    .where(*conditions)
+                    .cte("ranked_messages")
+                )
+                query = select(ranked_messages_cte).where(ranked_messages_cte.c.row_num <= limit_per_stream)
+            else:
+                query = select(*Messages.__table__.columns).where(*conditions)
+
+            result = await session.execute(query)
+            rows = result.all()
+
+            # 按 stream_id 分组
+            messages_by_stream = defaultdict(list)
+            columns = Messages.__table__.columns
+            for row in rows:
+                msg_dict = {c.name: getattr(row, c.name) for c in columns}
+                messages_by_stream[msg_dict["chat_id"]].append(msg_dict)
+
+            # 对每个流内的消息按时间升序排序
+            for messages in messages_by_stream.values():
+                messages.sort(key=lambda m: m["time"])
+
+            return dict(messages_by_stream)
+
+    except Exception as e:
+        log_message = (
+            f"使用 SQLAlchemy 批量查找聊天流消息失败 (streams={len(stream_ids)}, limit={limit_per_stream}): {e}\n"
+            + traceback.format_exc()
+        )
+        logger.error(log_message)
+        return {}
+
+
 # 你可以在这里添加更多与 messages 集合相关的数据库操作函数，例如 find_one_message, insert_message 等。
 # 注意：对于 SQLAlchemy，插入操作通常是使用 await session.add() 和 await session.commit()。
 # 查找单个消息可以使用 session.execute(select(Messages).where(...)).scalar_one_or_none()。
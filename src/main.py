@@ -345,7 +345,8 @@ class MainSystem:
         """并行处理消息的包装器"""
         try:
             start_time = time.time()
-            message_id = message_data.get("message_info", {}).get("message_id", "UNKNOWN")
+            message_info = message_data.get("message_info")
+            message_id = message_info.get("message_id", "UNKNOWN") if message_info else "UNKNOWN"
 
             # 检查系统是否正在关闭
             if self._shutting_down:
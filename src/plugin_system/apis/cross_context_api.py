@@ -2,26 +2,171 @@
 跨群聊上下文API
 """
 
+import asyncio
+import heapq
 import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from itertools import chain
 from typing import Any
 
-from src.chat.message_receive.chat_stream import ChatStream, get_chat_manager
-from src.chat.utils.chat_message_builder import (
-    build_readable_messages_with_id,
-    get_raw_msg_before_timestamp_with_chat,
-)
+from src.chat.message_receive.chat_stream import ChatManager, ChatStream, get_chat_manager
+from src.chat.utils.chat_message_builder import build_readable_messages_with_id
 from src.common.logger import get_logger
-from src.common.message_repository import get_user_messages_from_streams
+from src.common.message_repository import (
+    get_messages_before_timestamp_from_streams,
+    get_user_messages_from_streams,
+)
 from src.config.config import global_config
 from src.config.official_configs import ContextGroup
 
 logger = get_logger("cross_context_api")
 
+# 聊天名称缓存的有效期（秒），群名等变化后最多延迟这么久生效
+STREAM_NAME_CACHE_TTL = 300.0
+# stream_id -> (缓存时间, 聊天名称)
+_stream_name_cache: dict[str, tuple[float, str]] = {}
+
+
+# (聊天类型, 原始ID) -> 共享组 的反向索引，以及 chat_id -> 共享组 的查询缓存
+# 两者都绑定到构建时的 groups 配置对象，配置对象被替换（如重载）后自动重建
+_indexed_groups: list[ContextGroup] | None = None
+_chat_to_group: dict[tuple[str, str], ContextGroup] = {}
+_context_group_cache: dict[str, ContextGroup | None] = {}
+# 共享组 -> 其 chat_ids 的 (聊天类型, 原始ID) 集合，以 id(group) 为键并校验对象本身
+_blacklist_sets: dict[int, tuple[ContextGroup, frozenset[tuple[str, str]]]] = {}
+# 共享组 -> 预解析的 (聊天类型, 原始ID, 消息条数) 列表，缓存方式同上
+_parsed_chat_ids: dict[int, tuple[ContextGroup, list[tuple[str, str, int]]]] = {}
+
+
+def _get_chat_to_group_index() -> dict[tuple[str, str], ContextGroup]:
+    """获取 (聊天类型, 原始ID) -> 共享组 的反向索引，配置变化时重建"""
+    global _indexed_groups, _chat_to_group
+    groups = global_config.cross_context.groups
+    if groups is not _indexed_groups:
+        index: dict[tuple[str, str], ContextGroup] = {}
+        for group in groups:
+            # 排除maizone专用组
+            if group.name == "maizone_context_group":
+                continue
+            for chat_info in group.chat_ids:
+                if len(chat_info) >= 2:
+                    # 与按配置顺序查找一致：同一聊天属于多个组时取第一个
+                    index.setdefault((chat_info[0], str(chat_info[1])), group)
+        _chat_to_group = index
+        _indexed_groups = groups
+        _context_group_cache.clear()
+        _blacklist_sets.clear()
+        _parsed_chat_ids.clear()
+    return _chat_to_group
+
+
+def _get_blacklist_set(group: ContextGroup) -> frozenset[tuple[str, str]]:
+    """获取共享组 chat_ids 对应的 (聊天类型, 原始ID) 集合，首次使用时构建"""
+    _get_chat_to_group_index()  # 配置变化时顺带清空旧集合
+    entry = _blacklist_sets.get(id(group))
+    if entry is None or entry[0] is not group:
+        blacklist = frozenset((info[0], str(info[1])) for info in group.chat_ids if len(info) >= 2)
+        entry = (group, blacklist)
+        _blacklist_sets[id(group)] = entry
+    return entry[1]
+
+
+async def _get_stream_name(chat_manager: ChatManager, stream_id: str) -> str | None:
+    """带 TTL 缓存的 chat_manager.get_stream_name"""
+    now = time.monotonic()
+    cached = _stream_name_cache.get(stream_id)
+    if cached is not None and now - cached[0] < STREAM_NAME_CACHE_TTL:
+        return cached[1]
+
+    name = await chat_manager.get_stream_name(stream_id)
+    if name:
+        _stream_name_cache[stream_id] = (now, name)
+    else:
+        _stream_name_cache.pop(stream_id, None)
+    return name
+
+
+def _get_parsed_chat_ids(group: ContextGroup) -> list[tuple[str, str, int]]:
+    """获取共享组 chat_ids 预解析后的 (聊天类型, 原始ID, 消息条数) 列表，首次使用时构建"""
+    _get_chat_to_group_index()  # 配置变化时顺带清空旧结果
+    entry = _parsed_chat_ids.get(id(group))
+    if entry is None or entry[0] is not group:
+        default_limit = group.default_limit
+        parsed = [
+            (info[0], info[1], int(info[2]) if len(info) > 2 else default_limit)
+            for info in group.chat_ids
+        ]
+        entry = (group, parsed)
+        _parsed_chat_ids[id(group)] = entry
+    return entry[1]
+
+
+def _recent_messages_header(chat_name: str) -> str:
+    return f'[以下是来自"{chat_name}"的近期消息]\n'
+
+
+async def _format_context_blocks(
+    chat_manager: ChatManager,
+    chats: Iterable[tuple[str, str, list[dict[str, Any]]]],
+    make_header: Callable[[str], str] = _recent_messages_header,
+) -> list[tuple[str, str]]:
+    """
+    并发格式化多个聊天的消息，是各上下文构建函数共用的格式化路径。
+
+    Args:
+        chat_manager: 聊天管理器。
+        chats: (stream_id, 找不到名称时的默认名称, 消息列表) 的序列，消息为空的聊天会被跳过。
+        make_header: 根据聊天名称生成块标题的函数。
+
+    Returns:
+        按输入顺序排列的 (标题, 正文) 块列表，格式化失败的聊天会被跳过。
+    """
+
+    async def _format_one(stream_id: str, fallback_name: str, messages: list[dict[str, Any]]) -> tuple[str, str] | None:
+        try:
+            chat_name = await _get_stream_name(chat_manager, stream_id) or fallback_name
+            formatted_messages, _ = await build_readable_messages_with_id(messages, timestamp_mode="relative")
+            return make_header(chat_name), formatted_messages
+        except Exception as e:
+            logger.error(f"格式化聊天 {stream_id} 的消息失败: {e}")
+            return None
+
+    results = await asyncio.gather(*(_format_one(*chat) for chat in chats if chat[2]))
+    return [result for result in results if result]
+
+
+def _join_context_blocks(blocks: list[tuple[str, str]]) -> str:
+    """将 (标题, 正文) 块一次性拼接为跨上下文参考文本，避免产生中间字符串"""
+    parts = ["# 跨上下文参考\n"]
+    for i, (header, body) in enumerate(blocks):
+        if i:
+            parts.append("\n\n")
+        parts.append(header)
+        parts.append(body)
+    parts.append("\n")
+    return "".join(parts)
+
+
+def _build_stream_index(streams: dict[str, ChatStream]) -> dict[tuple[str, str], ChatStream]:
+    """一次遍历建立 (聊天类型, 原始ID) -> 聊天流 的索引，同一键保留遍历顺序中的第一个"""
+    index: dict[tuple[str, str], ChatStream] = {}
+    for stream in list(streams.values()):
+        if stream.group_info:
+            index.setdefault(("group", str(stream.group_info.group_id)), stream)
+        elif stream.user_info:
+            index.setdefault(("private", str(stream.user_info.user_id)), stream)
+    return index
+
 
 async def get_context_group(chat_id: str) -> ContextGroup | None:
     """
     获取当前聊天所在的共享组
     """
+    index = _get_chat_to_group_index()
+    if chat_id in _context_group_cache:
+        return _context_group_cache[chat_id]
+
     current_stream = await get_chat_manager().get_stream(chat_id)
     if not current_stream:
         return None
@@ -38,17 +183,10 @@ async def get_context_group(chat_id: str) -> ContextGroup | None:
         return None
     current_type = "group" if is_group else "private"
 
-    for group in global_config.cross_context.groups:
-        for chat_info in group.chat_ids:
-            if len(chat_info) >= 2:
-                chat_type, chat_raw_id = chat_info[0], chat_info[1]
-                if chat_type == current_type and str(chat_raw_id) == str(current_chat_raw_id):
-                    # 排除maizone专用组
-                    if group.name == "maizone_context_group":
-                        continue
-                    return group
-
-    return None
+    # 聊天流的类型和原始ID不会改变，结果可以按 chat_id 缓存
+    group = index.get((current_type, str(current_chat_raw_id)))
+    _context_group_cache[chat_id] = group
+    return group
 
 
 async def build_cross_context_normal(chat_stream: ChatStream, context_group: ContextGroup) -> str:
@@ -64,63 +202,59 @@ async def build_cross_context_normal(chat_stream: ChatStream, context_group: Con
     Returns:
         一个包含格式化后的跨上下文消息的字符串，如果无消息则为空字符串。
     """
-    cross_context_messages = []
     chat_manager = get_chat_manager()
 
-    chat_infos_to_fetch = []
+    chat_infos_to_fetch: list[tuple[str, str, int]]
     if context_group.mode == "blacklist":
         # 黑名单模式：获取所有聊天，并排除在 chat_ids 中定义过的聊天
-        blacklisted_ids = {tuple(info[:2]) for info in context_group.chat_ids}
-        for stream_id, stream in chat_manager.streams.items():
-            is_group = stream.group_info is not None
-            chat_type = "group" if is_group else "private"
-
-            # 安全地获取 raw_id
-            if is_group and stream.group_info:
-                raw_id = stream.group_info.group_id
-            elif not is_group and stream.user_info:
-                raw_id = stream.user_info.user_id
-            else:
-                continue  # 如果缺少关键信息则跳过
-
-            # 如果当前聊天不在黑名单中，则添加到待获取列表
-            if (chat_type, str(raw_id)) not in blacklisted_ids:
-                chat_infos_to_fetch.append([chat_type, str(raw_id), str(context_group.default_limit)])
+        blacklisted_ids = _get_blacklist_set(context_group)
+        default_limit = context_group.default_limit
+        chat_infos_to_fetch = [
+            (chat_type, raw_id, default_limit)
+            for chat_type, raw_id in _build_stream_index(chat_manager.streams)
+            if (chat_type, raw_id) not in blacklisted_ids
+        ]
     else:
-        # 白名单模式：直接使用配置中定义的 chat_ids
-        chat_infos_to_fetch = context_group.chat_ids
-
-    # 遍历待获取列表，抓取并格式化消息
-    for chat_info in chat_infos_to_fetch:
-        chat_type, chat_raw_id, limit_str = (
-            chat_info[0],
-            chat_info[1],
-            chat_info[2] if len(chat_info) > 2 else str(context_group.default_limit),
-        )
-        limit = int(limit_str)
-        is_group = chat_type == "group"
-        stream_id = chat_manager.get_stream_id(chat_stream.platform, chat_raw_id, is_group=is_group)
-        if not stream_id or stream_id == chat_stream.stream_id:
+        # 白名单模式：使用预解析的 chat_ids
+        chat_infos_to_fetch = _get_parsed_chat_ids(context_group)
+
+    # 所有聊天使用同一时间点，保证各聊天的上下文窗口一致
+    now = time.time()
+    platform = chat_stream.platform
+    current_stream_id = chat_stream.stream_id
+    get_stream_id = chat_manager.get_stream_id
+
+    # 先解析出要抓取的聊天流，并按消息条数上限分组，每组只需一次数据库查询
+    targets: list[tuple[str, str]] = []  # (stream_id, chat_raw_id)
+    stream_ids_by_limit: defaultdict[int, list[str]] = defaultdict(list)
+    for chat_type, chat_raw_id, limit in chat_infos_to_fetch:
+        stream_id = get_stream_id(platform, chat_raw_id, is_group=chat_type == "group")
+        if not stream_id or stream_id == current_stream_id:
             continue
+        targets.append((stream_id, chat_raw_id))
+        stream_ids_by_limit[limit].append(stream_id)
+
+    messages_by_stream: dict[str, list[dict[str, Any]]] = {}
+    for batch in await asyncio.gather(
+        *(
+            get_messages_before_timestamp_from_streams(stream_ids, now, limit)
+            for limit, stream_ids in stream_ids_by_limit.items()
+        )
+    ):
+        messages_by_stream.update(batch)
 
-        try:
-            messages = await get_raw_msg_before_timestamp_with_chat(
-                chat_id=stream_id,
-                timestamp=time.time(),
-                limit=limit,
-            )
-            if messages:
-                chat_name = await chat_manager.get_stream_name(stream_id) or chat_raw_id
-                formatted_messages, _ = await build_readable_messages_with_id(messages, timestamp_mode="relative")
-                cross_context_messages.append(f'[以下是来自"{chat_name}"的近期消息]\n{formatted_messages}')
-        except Exception as e:
-            logger.error(f"获取聊天 {chat_raw_id} 的消息失败: {e}")
-            continue
+    cross_context_messages = await _format_context_blocks(
+        chat_manager,
+        (
+            (stream_id, chat_raw_id, messages_by_stream.get(stream_id, []))
+            for stream_id, chat_raw_id in targets
+        ),
+    )
 
     if not cross_context_messages:
         return ""
 
-    return "# 跨上下文参考\n" + "\n\n".join(cross_context_messages) + "\n"
+    return _join_context_blocks(cross_context_messages)
 
 
 async def build_cross_context_s4u(
@@ -155,7 +289,7 @@ async def build_cross_context_s4u(
                 limit_per_stream=cross_context_config.s4u_limit,
             )
             if private_messages := messages_by_stream.get(private_stream_id):
-                chat_name = await chat_manager.get_stream_name(private_stream_id) or "私聊"
+                chat_name = await _get_stream_name(chat_manager, private_stream_id) or "私聊"
                 title = f'[以下是您与"{chat_name}"的近期私聊记录]\n'
                 formatted, _ = await build_readable_messages_with_id(private_messages, timestamp_mode="relative")
                 private_context_block = f"{title}{formatted}"
@@ -216,15 +350,14 @@ async def build_cross_context_s4u(
         remaining_limit = cross_context_config.s4u_stream_limit - (1 if private_context_block else 0)
         limited_group_messages = all_group_messages[:remaining_limit]
 
-        for item in limited_group_messages:
-            try:
-                chat_name = await chat_manager.get_stream_name(item["stream_id"]) or "未知群聊"
-                user_name = target_user_info.get("person_name") or target_user_info.get("user_nickname") or user_id
-                title = f'[以下是"{user_name}"在"{chat_name}"的近期发言]\n'
-                formatted, _ = await build_readable_messages_with_id(item["messages"], timestamp_mode="relative")
-                group_context_blocks.append(f"{title}{formatted}")
-            except Exception as e:
-                logger.error(f"S4U模式下格式化群聊消息失败 (stream: {item['stream_id']}): {e}")
+        user_name = target_user_info.get("person_name") or target_user_info.get("user_nickname") or user_id
+
+        blocks = await _format_context_blocks(
+            chat_manager,
+            ((item["stream_id"], "未知群聊", item["messages"]) for item in limited_group_messages),
+            lambda chat_name: f'[以下是"{user_name}"在"{chat_name}"的近期发言]\n',
+        )
+        group_context_blocks = [f"{title}{formatted}" for title, formatted in blocks]
 
     # --- 3. 组合最终上下文 ---
     if not private_context_block and not group_context_blocks:
@@ -269,86 +402,54 @@ async def get_intercom_group_context(group_name: str, limit_per_chat: int = 20,
     chat_manager = get_chat_manager()
 
     # 1. 根据黑白名单模式确定要处理的聊天列表
+    # 一次性建立聊天流索引，之后每个聊天只需一次字典查找
+    stream_index = _build_stream_index(chat_manager.streams)
     chat_infos_to_fetch = []
     if target_group.mode == "blacklist":
-        blacklisted_ids = {tuple(info[:2]) for info in target_group.chat_ids}
-        for stream in chat_manager.streams.values():
-            is_group = stream.group_info is not None
-            chat_type = "group" if is_group else "private"
-
-            if is_group and stream.group_info:
-                raw_id = stream.group_info.group_id
-            elif not is_group and stream.user_info:
-                raw_id = stream.user_info.user_id
-            else:
-                continue
-
-            if (chat_type, str(raw_id)) not in blacklisted_ids:
-                chat_infos_to_fetch.append([chat_type, str(raw_id)])
+        blacklisted_ids = _get_blacklist_set(target_group)
+        chat_infos_to_fetch = [list(key) for key in stream_index if key not in blacklisted_ids]
     else:  # whitelist mode
         chat_infos_to_fetch = target_group.chat_ids
 
-    # 2. 获取所有相关消息
-    all_messages = []
+    # 2. 一次查询获取所有相关聊天的消息，所有聊天使用同一时间点
+    stream_ids: dict[str, None] = {}  # 有序去重
     for chat_info in chat_infos_to_fetch:
         chat_type, chat_raw_id = chat_info[0], chat_info[1]
-        is_group = chat_type == "group"
-
-        # 查找 stream
-        found_stream = None
-        for stream in chat_manager.streams.values():
-            if is_group:
-                if stream.group_info and stream.group_info.group_id == chat_raw_id:
-                    found_stream = stream
-                    break
-            else:  # private
-                if stream.user_info and stream.user_info.user_id == chat_raw_id and not stream.group_info:
-                    found_stream = stream
-                    break
+        found_stream = stream_index.get((chat_type, str(chat_raw_id)))
         if not found_stream:
             logger.warning(f"在已加载的聊天流中找不到ID为 {chat_raw_id} 的聊天。")
             continue
-        stream_id = found_stream.stream_id
-
-        try:
-            messages = await get_raw_msg_before_timestamp_with_chat(
-                chat_id=stream_id,
-                timestamp=time.time(),
-                limit=limit_per_chat,
-            )
-            if messages:
-                # 为每条消息附加 stream_id 以便后续分组
-                for msg in messages:
-                    msg["_stream_id"] = stream_id
-                all_messages.extend(messages)
-        except Exception as e:
-            logger.error(f"获取聊天 {chat_raw_id} 的消息失败: {e}")
+        stream_ids[found_stream.stream_id] = None
+
+    # 条数上限 <= 0 表示不限制，与 get_messages_before_timestamp_from_streams 的约定一致
+    fetch_limit = max(limit_per_chat, 0)
+    if total_limit > 0:
+        # 单个聊天最多只能贡献 total_limit 条消息，无需多取
+        fetch_limit = min(fetch_limit, total_limit) if fetch_limit > 0 else total_limit
+    results = await get_messages_before_timestamp_from_streams(list(stream_ids), time.time(), fetch_limit)
+    all_messages = chain.from_iterable(results.values())
+
+    # 3. 应用总数限制：只取最新的 total_limit 条，无需对全部消息排序
+    if total_limit > 0:
+        latest_messages = heapq.nlargest(total_limit, all_messages, key=lambda x: x.get("time", 0))
+    else:
+        latest_messages = sorted(all_messages, key=lambda x: x.get("time", 0), reverse=True)
 
-    if not all_messages:
+    if not latest_messages:
         return None
 
-    # 3. 应用总数限制
-    all_messages.sort(key=lambda x: x.get("time", 0))
-    if len(all_messages) > total_limit:
-        all_messages = all_messages[-total_limit:]
-
-    # 4. 按聊天分组并格式化
-    messages_by_stream = {}
-    for msg in all_messages:
-        stream_id = msg.get("_stream_id")
-        if stream_id not in messages_by_stream:
-            messages_by_stream[stream_id] = []
-        messages_by_stream[stream_id].append(msg)
-
-    cross_context_messages = []
-    for stream_id, messages in messages_by_stream.items():
-        if messages:
-            chat_name = await chat_manager.get_stream_name(stream_id) or "未知聊天"
-            formatted_messages, _ = await build_readable_messages_with_id(messages, timestamp_mode="relative")
-            cross_context_messages.append(f'[以下是来自"{chat_name}"的近期消息]\n{formatted_messages}')
+    # 4. 按时间先后按聊天分组并格式化
+    messages_by_stream: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+    for msg in reversed(latest_messages):
+        messages_by_stream[msg["chat_id"]].append(msg)
+
+    cross_context_messages = await _format_context_blocks(
+        chat_manager,
+        ((stream_id, "未知聊天", messages) for stream_id, messages in messages_by_stream.items()),
+    )
 
     if not cross_context_messages:
         return None
 
-    return "# 跨上下文参考\n" + "\n\n".join(cross_context_messages) + "\n"
+    return _join_context_blocks(cross_context_messages)
 
@@ -20,17 +20,47 @@
 
     # 检查情绪是否被锁定
     is_locked = mood_api.is_mood_locked(chat_id)
+
+    # 批量检查多个聊天的情绪锁定状态
+    locked_map = mood_api.are_moods_locked(chat_ids)
 """
 
 import asyncio
+from collections.abc import Iterable
 
 from src.common.logger import get_logger
 from src.mood.mood_manager import mood_manager
 
 logger = get_logger("mood_api")
 
-# 用于存储情绪解锁任务
-_unlock_tasks: dict[str, asyncio.Task] = {}
+# 用于存储情绪定时解锁的计时器句柄
+_unlock_handles: dict[str, asyncio.TimerHandle] = {}
+
+# insomnia_chats 在 mood_manager 生命周期内不会被重新赋值，直接缓存其成员检查方法
+_is_locked = mood_manager.insomnia_chats.__contains__
+
+
+def _release_lock(chat_id: str) -> bool:
+    """解除情绪锁定，只做一次集合操作，返回此前是否处于锁定状态"""
+    try:
+        mood_manager.insomnia_chats.remove(chat_id)
+    except KeyError:
+        return False
+    return True
+
+
+def _cancel_auto_unlock(chat_id: str):
+    """取消指定聊天尚未触发的自动解锁"""
+    handle = _unlock_handles.pop(chat_id, None)
+    if handle is not None:
+        handle.cancel()
+
+
+def _auto_unlock(chat_id: str):
+    """定时器回调：到期后自动解除情绪锁定"""
+    _unlock_handles.pop(chat_id, None)
+    if _release_lock(chat_id):
+        logger.info(f"[{chat_id}] 情绪已自动解锁。")
 
 
 def get_mood(chat_id: str) -> str:
@@ -77,23 +107,15 @@ async def lock_mood(chat_id: str, duration: float | None = None):
         bool: 操作是否成功
     """
     try:
-        if chat_id in _unlock_tasks:
-            _unlock_tasks[chat_id].cancel()
-            del _unlock_tasks[chat_id]
+        _cancel_auto_unlock(chat_id)
 
         mood_manager.insomnia_chats.add(chat_id)
         logger.info(f"[{chat_id}] 情绪已锁定。")
 
         if duration:
             logger.info(f"[{chat_id}] 情绪将于 {duration} 秒后自动解锁。")
-
-            async def _unlock_after():
-                await asyncio.sleep(duration)
-                if chat_id in mood_manager.insomnia_chats:
-                    await unlock_mood(chat_id)
-                    logger.info(f"[{chat_id}] 情绪已自动解锁。")
-            task = asyncio.create_task(_unlock_after())
-            _unlock_tasks[chat_id] = task
+            # 使用计时器句柄而非休眠任务，到期直接回调，取消也无需调度协程
+            _unlock_handles[chat_id] = asyncio.get_running_loop().call_later(duration, _auto_unlock, chat_id)
         return True
     except Exception as e:
         logger.error(f"锁定指定聊天的情绪时发生错误:{e}")
@@ -107,12 +129,9 @@ async def unlock_mood(chat_id: str) -> bool:
     Returns:
         bool: 如果成功解锁则返回 True，如果情绪未被锁定则返回 False。
     """
-    if chat_id in _unlock_tasks:
-        _unlock_tasks[chat_id].cancel()
-        del _unlock_tasks[chat_id]
+    _cancel_auto_unlock(chat_id)
 
-    if chat_id in mood_manager.insomnia_chats:
-        mood_manager.insomnia_chats.remove(chat_id)
+    if _release_lock(chat_id):
         logger.info(f"[{chat_id}] 情绪已手动解锁。")
         return True
     return False
@@ -124,4 +143,16 @@ def is_mood_locked(chat_id: str) -> bool:
     Returns:
         bool: 如果情绪被锁定，则返回 True，否则返回 False。
     """
-    return chat_id in mood_manager.insomnia_chats
+    return _is_locked(chat_id)
+
+
+def are_moods_locked(chat_ids: Iterable[str]) -> dict[str, bool]:
+    """批量检查多个聊天的情绪是否处于锁定状态。
+
+    Args:
+        chat_ids (Iterable[str]): 聊天ID列表
+
+    Returns:
+        dict[str, bool]: 聊天ID -> 是否被锁定
+    """
+    return {chat_id: _is_locked(chat_id) for chat_id in chat_ids}
@@ -169,7 +169,8 @@ def put_adapter_response(request_id: str, response_data: dict) -> None:
 
 async def wait_adapter_response(request_id: str, timeout: float = 30.0) -> dict:
     """等待适配器响应"""
-    future = asyncio.Future()
+    # 通过运行中的事件循环创建 Future，启用 uvloop 时可使用其原生实现
+    future = asyncio.get_running_loop().create_future()
     _adapter_response_pool[request_id] = future
 
     try:
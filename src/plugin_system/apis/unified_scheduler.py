@@ -163,6 +163,11 @@ class ScheduleTask:
     # 运行时引用
     _asyncio_task: asyncio.Task | None = field(default=None, init=False, repr=False)
     _weak_scheduler: Any = field(default=None, init=False, repr=False)
+    # 回调类型在创建时判定一次，避免每次触发都调用 iscoroutinefunction
+    _callback_is_async: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._callback_is_async = asyncio.iscoroutinefunction(self.callback)
 
     def __repr__(self) -> str:
         return (
@@ -685,7 +690,7 @@ class UnifiedScheduler:
     async def _run_callback(self, task: ScheduleTask) -> Any:
         """运行任务回调函数"""
         try:
-            if asyncio.iscoroutinefunction(task.callback):
+            if task._callback_is_async:
                 result = await task.callback(*task.callback_args, **task.callback_kwargs)
             else:
                 # 同步函数在线程池中运行，避免阻塞事件循环
@@ -775,7 +780,7 @@ class UnifiedScheduler:
                     # 合并事件参数和任务参数
                     merged_kwargs = {**task.callback_kwargs, **event_params}
 
-                    if asyncio.iscoroutinefunction(task.callback):
+                    if task._callback_is_async:
                         await asyncio.wait_for(task.callback(*task.callback_args, **merged_kwargs), timeout=timeout)
                     else:
                         loop = asyncio.get_running_loop()
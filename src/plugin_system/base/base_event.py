@@ -101,6 +101,19 @@ class BaseEvent:
     def __name__(self):
         return self.name
 
+    @staticmethod
+    def _subscriber_sort_key(handler: "BaseEventHandler") -> tuple[int, int]:
+        """订阅者排序键，-1 代表自动权重，按 0 参与排序"""
+        weight = getattr(handler, "weight", 0)
+        return (0 if weight == -1 else weight, weight)
+
+    def sort_subscribers(self) -> None:
+        """按权重从高到低排序订阅者
+
+        在订阅关系变化时调用一次，activate 时直接按该顺序执行，无需每次激活都重新排序
+        """
+        self.subscribers.sort(key=self._subscriber_sort_key, reverse=True)
+
     async def activate(self, params: dict) -> HandlerResultsCollection:
         """激活事件，执行所有订阅的处理器
 
@@ -115,11 +128,10 @@ class BaseEvent:
 
         # 使用锁确保同一个事件不能同时激活多次
         async with self.event_handle_lock:
-            # 按权重从高到低排序订阅者
-            # 使用直接属性访问，-1代表自动权重
-            sorted_subscribers = sorted(
-                self.subscribers, key=lambda h: h.weight if hasattr(h, "weight") and h.weight != -1 else 0, reverse=True
-            )
+            # 订阅者在订阅时已按权重排好序，这里只取快照，避免执行期间订阅关系变化
+            sorted_subscribers = tuple(self.subscribers)
+            if not sorted_subscribers:
+                return HandlerResultsCollection([])
 
             # 并行执行所有订阅者
             tasks = []
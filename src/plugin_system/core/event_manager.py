@@ -242,7 +242,7 @@ class EventManager:
         event.subscribers.append(handler_instance)
 
         # 按权重从高到低排序订阅者
-        event.subscribers.sort(key=lambda h: getattr(h, "weight", 0), reverse=True)
+        event.sort_subscribers()
 
         logger.info(f"事件处理器 {handler_name} 成功订阅到事件 {event_name}，当前权重排序完成")
         return True
@@ -5,6 +5,7 @@ MCP Client Manager
 """
 
 import asyncio
+import logging
 import shutil
 from pathlib import Path
 from typing import Any
@@ -122,6 +123,10 @@ class MCPClientManager:
         2. 为每个启用的服务器创建客户端
         3. 建立连接并验证
         """
+        # 已初始化时无需进入锁，锁内仍会再次检查以防并发初始化
+        if self._initialized:
+            return
+
         async with self._lock:
             if self._initialized:
                 logger.debug("MCP 客户端管理器已初始化，跳过")
@@ -242,13 +247,14 @@ class MCPClientManager:
         if not self._initialized:
             await self.initialize()
 
-        if server_name not in self.clients:
+        client = self.clients.get(server_name)
+        if client is None:
             raise ValueError(f"MCP 服务器 '{server_name}' 未连接")
 
-        client = self.clients[server_name]
-
         try:
-            logger.debug(f"调用 MCP 工具: {server_name}.{tool_name} | 参数: {arguments}")
+            # 参数字典可能很大，仅在开启 DEBUG 时才格式化
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"调用 MCP 工具: {server_name}.{tool_name} | 参数: {arguments}")
             result = await client.call_tool(tool_name, arguments or {})
             logger.debug(f"MCP 工具调用成功: {server_name}.{tool_name}")
             return result
@@ -4,6 +4,7 @@ MCP Tool Adapter
 将 MCP 工具适配为 BaseTool，使其能够被插件系统识别和调用
 """
 
+import logging
 from typing import Any
 
 import mcp.types
@@ -17,6 +18,43 @@ from .mcp_client_manager import mcp_client_manager
 logger = get_logger("mcp_tool_adapter")
 
 
+def _format_text_content(content_item: Any) -> str:
+    # TextContent 类型
+    return getattr(content_item, "text", "")
+
+
+def _format_image_content(content_item: Any) -> str:
+    # ImageContent 类型
+    data = getattr(content_item, "data", b"")
+    return f"[Image data: {len(data)} bytes]"
+
+
+def _format_audio_content(content_item: Any) -> str:
+    # AudioContent 类型
+    data = getattr(content_item, "data", b"")
+    return f"[Audio data: {len(data)} bytes]"
+
+
+def _format_other_content(content_item: Any) -> str:
+    # 尝试提取 text 或 data 属性
+    text = getattr(content_item, "text", None)
+    if text is not None:
+        return text
+    data = getattr(content_item, "data", None)
+    if data is not None:
+        data_len = len(data) if hasattr(data, "__len__") else "unknown"
+        return f"[Binary data: {data_len} bytes]"
+    return str(content_item)
+
+
+# 内容类型 -> 文本提取函数，未知类型使用 _format_other_content
+_CONTENT_FORMATTERS = {
+    "text": _format_text_content,
+    "image": _format_image_content,
+    "audio": _format_audio_content,
+}
+
+
 class MCPToolAdapter(BaseTool):
     """
     MCP 工具适配器
@@ -120,7 +158,8 @@ class MCPToolAdapter(BaseTool):
             Dict: 工具执行结果
         """
         try:
-            logger.debug(f"执行 MCP 工具: {self.name} | 服务器: {self.server_name} | 参数: {function_args}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"执行 MCP 工具: {self.name} | 服务器: {self.server_name} | 参数: {function_args}")
 
             # 移除 llm_called 标记（这是内部使用的）
             clean_args = {k: v for k, v in function_args.items() if k != "llm_called"}
@@ -159,36 +198,12 @@ class MCPToolAdapter(BaseTool):
                 "id": self.name,
             }
 
-        # 提取所有内容
-        content_parts = []
-        for content_item in result.content:
-            # 根据内容类型提取文本
-            content_type = getattr(content_item, "type", None)
-
-            if content_type == "text":
-                # TextContent 类型
-                text = getattr(content_item, "text", "")
-                content_parts.append(text)
-            elif content_type == "image":
-                # ImageContent 类型
-                data = getattr(content_item, "data", b"")
-                content_parts.append(f"[Image data: {len(data)} bytes]")
-            elif content_type == "audio":
-                # AudioContent 类型
-                data = getattr(content_item, "data", b"")
-                content_parts.append(f"[Audio data: {len(data)} bytes]")
-            else:
-                # 尝试提取 text 或 data 属性
-                text = getattr(content_item, "text", None)
-                if text is not None:
-                    content_parts.append(text)
-                else:
-                    data = getattr(content_item, "data", None)
-                    if data is not None:
-                        data_len = len(data) if hasattr(data, "__len__") else "unknown"
-                        content_parts.append(f"[Binary data: {data_len} bytes]")
-                    else:
-                        content_parts.append(str(content_item))
+        # 根据内容类型查表提取文本，单次遍历完成
+        formatters = _CONTENT_FORMATTERS
+        content_parts = [
+            formatters.get(getattr(content_item, "type", None), _format_other_content)(content_item)
+            for content_item in result.content
+        ]
 
         return {
             "type": "mcp_result",
@@ -44,7 +44,6 @@ async def message_recv(server_connection: Server.ServerConnection):
         # 只在debug模式下记录原始消息
         if logger.level <= 10:  # DEBUG level
             logger.debug(f"{raw_message[:1500]}..." if (len(raw_message) > 1500) else raw_message)
-        decoded_raw_message: dict = orjson.loads(raw_message)
         try:
             # 首先尝试解析原始消息
             decoded_raw_message: dict = orjson.loads(raw_message)
@@ -9,6 +9,8 @@ logger = get_logger("napcat_adapter")
 
 response_dict: Dict = {}
 response_time_dict: Dict = {}
+# 正在等待响应的请求：echo_id -> Future，响应到达时直接唤醒，无需轮询
+response_waiters: Dict[str, asyncio.Future] = {}
 plugin_config = None
 
 
@@ -20,7 +22,7 @@ def set_plugin_config(config: dict):
 
 async def get_response(request_id: str, timeout: int = 10) -> dict:
     response = await asyncio.wait_for(_get_response(request_id), timeout)
-    _ = response_time_dict.pop(request_id)
+    _ = response_time_dict.pop(request_id, None)
     logger.debug(f"响应信息id: {request_id} 已从响应字典中取出")
     return response
 
@@ -29,13 +31,26 @@ async def _get_response(request_id: str) -> dict:
     """
     内部使用的获取响应函数，主要用于在需要时获取响应
     """
-    while request_id not in response_dict:
-        await asyncio.sleep(0.2)
-    return response_dict.pop(request_id)
+    # 响应可能在开始等待前就已到达
+    if request_id in response_dict:
+        return response_dict.pop(request_id)
+
+    future = asyncio.get_running_loop().create_future()
+    response_waiters[request_id] = future
+    try:
+        return await future
+    finally:
+        response_waiters.pop(request_id, None)
 
 
 async def put_response(response: dict):
     echo_id = response.get("echo")
+    future = response_waiters.pop(echo_id, None)
+    if future is not None and not future.done():
+        future.set_result(response)
+        logger.debug(f"响应信息id: {echo_id} 已直接交付给等待者")
+        return
+
     now_time = time.time()
     response_dict[echo_id] = response
     response_time_dict[echo_id] = now_time
@@ -55,7 +70,7 @@ async def check_timeout_response() -> None:
         for echo_id, response_time in list(response_time_dict.items()):
             if now_time - response_time > heartbeat_interval:
                 cleaned_message_count += 1
-                response_dict.pop(echo_id)
+                response_dict.pop(echo_id, None)
                 response_time_dict.pop(echo_id)
                 logger.warning(f"响应消息 {echo_id} 超时，已删除")
         if cleaned_message_count > 0:
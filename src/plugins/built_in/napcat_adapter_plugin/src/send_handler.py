@@ -112,7 +112,8 @@ class SendHandler:
         )
         if response.get("status") == "ok":
             logger.info("消息发送成功")
-            qq_message_id = response.get("data", {}).get("message_id")
+            data = response.get("data")
+            qq_message_id = data.get("message_id") if data else None
             await self.message_sent_back(raw_message_base, qq_message_id)
         else:
             logger.warning(f"消息发送失败，napcat返回：{str(response)}")
@@ -322,7 +323,8 @@ class SendHandler:
 
             replied_user_id = None
             if msg_info_response and msg_info_response.get("status") == "ok":
-                sender_info = msg_info_response.get("data", {}).get("sender")
+                data = msg_info_response.get("data")
+                sender_info = data.get("sender") if data else None
                 if sender_info:
                     replied_user_id = sender_info.get("user_id")
 
@@ -89,14 +89,15 @@ class StreamConsumer:
         try:
             while self.is_running:
                 try:
-                    # 等待消息，1秒超时
-                    message = await asyncio.wait_for(
-                        self.queue.get(),
-                        timeout=1.0
-                    )
-                    
-                    start_time = time.time()
-                    
+                    # stop() 会直接取消该协程，因此无需为等待设置超时
+                    message = await self.queue.get()
+                except asyncio.CancelledError:
+                    logger.info(f"Stream {self.stream_id} 处理循环被取消")
+                    break
+                
+                start_time = time.time()
+                
+                try:
                     # 处理消息
                     post_type = message.get("post_type")
                     if post_type == "message":
@@ -107,39 +108,29 @@ class StreamConsumer:
                         await notice_handler.handle_notice(message)
                     else:
                         logger.warning(f"未知的 post_type: {post_type}")
-                    
-                    processing_time = time.time() - start_time
-                    
-                    # 更新统计
-                    self.stats["total_messages"] += 1
-                    self.stats["total_processing_time"] += processing_time
-                    self.last_active_time = time.time()
-                    self.queue.task_done()
-                    
-                    # 性能监控（每100条消息输出一次）
-                    if self.stats["total_messages"] % 100 == 0:
-                        avg_time = self.stats["total_processing_time"] / self.stats["total_messages"]
-                        logger.info(
-                            f"Stream {self.stream_id[:30]}... 统计: "
-                            f"消息数={self.stats['total_messages']}, "
-                            f"平均耗时={avg_time:.3f}秒, "
-                            f"队列长度={self.queue.qsize()}"
-                        )
-                    
-                    # 动态延迟：队列空时短暂休眠
-                    if self.queue.qsize() == 0:
-                        await asyncio.sleep(0.01)
-                
-                except asyncio.TimeoutError:
-                    # 超时是正常的，继续循环
-                    continue
-                except asyncio.CancelledError:
-                    logger.info(f"Stream {self.stream_id} 处理循环被取消")
-                    break
                 except Exception as e:
                     logger.error(f"Stream {self.stream_id} 处理消息时出错: {e}", exc_info=True)
                     # 继续处理下一条消息
-                    await asyncio.sleep(0.1)
+                    continue
+                finally:
+                    self.queue.task_done()
+                
+                processing_time = time.time() - start_time
+                
+                # 更新统计
+                self.stats["total_messages"] += 1
+                self.stats["total_processing_time"] += processing_time
+                self.last_active_time = time.time()
+                
+                # 性能监控（每100条消息输出一次）
+                if self.stats["total_messages"] % 100 == 0:
+                    avg_time = self.stats["total_processing_time"] / self.stats["total_messages"]
+                    logger.info(
+                        f"Stream {self.stream_id[:30]}... 统计: "
+                        f"消息数={self.stats['total_messages']}, "
+                        f"平均耗时={avg_time:.3f}秒, "
+                        f"队列长度={self.queue.qsize()}"
+                    )
         
         finally:
             logger.info(f"Stream {self.stream_id} 处理循环结束")
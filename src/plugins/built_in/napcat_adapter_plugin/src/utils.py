@@ -26,6 +26,18 @@ class SSLAdapter(urllib3.PoolManager):
         super().__init__(*args, **kwargs)
 
 
+# 图片下载共用的连接池；SSLContext 的创建需要加载证书，开销较大，只在首次使用时构建一次
+_image_http: Optional[SSLAdapter] = None
+
+
+def _get_image_http() -> SSLAdapter:
+    """获取图片下载共用的连接池"""
+    global _image_http
+    if _image_http is None:
+        _image_http = SSLAdapter()
+    return _image_http
+
+
 async def get_group_info(websocket: Server.ServerConnection, group_id: int) -> dict | None:
     """
     获取群相关信息
@@ -102,7 +114,7 @@ async def get_image_base64(url: str) -> str:
     # sourcery skip: raise-specific-error
     """获取图片/表情包的Base64"""
     logger.debug(f"下载图片: {url}")
-    http = SSLAdapter()
+    http = _get_image_http()
     try:
         response = http.request("GET", url, timeout=10)
         if response.status != 200:
@@ -8,6 +8,10 @@ from src.plugin_system.apis import config_api
 
 logger = get_logger("napcat_adapter")
 
+# 正向/反向连接共用的 WebSocket 参数
+# Napcat 通常与 adapter 部署在同一主机，关闭 permessage-deflate 以省去每帧的压缩/解压开销
+WS_CONNECTION_OPTIONS: dict[str, Any] = {"max_size": 2**26, "compression": None}
+
 
 class WebSocketManager:
     """WebSocket 连接管理器，支持正向和反向连接"""
@@ -52,7 +56,7 @@ class WebSocketManager:
                 self.connection = None
                 logger.info("Napcat 客户端已断开连接")
 
-        self.server = await Server.serve(handle_client, host, port, max_size=2**26)
+        self.server = await Server.serve(handle_client, host, port, **WS_CONNECTION_OPTIONS)
         self.is_running = True
         logger.info(f"反向连接服务器已启动，监听地址: ws://{host}:{port}")
 
@@ -71,7 +75,7 @@ class WebSocketManager:
                 logger.info(f"尝试连接到 Napcat 服务器: {url}")
 
                 # 准备连接参数
-                connect_kwargs = {"max_size": 2**26}
+                connect_kwargs = dict(WS_CONNECTION_OPTIONS)
 
                 # 如果配置了访问令牌，添加到请求头
                 access_token = config_api.get_plugin_config(self.plugin_config, "napcat_server.access_token")